@@ -0,0 +1,333 @@
+"""
+Offline micro- and macro-benchmarks for the benchmark harness and scraper parsing.
+
+Runs against synthetic question banks and the mock provider, reports throughput,
+latency percentiles and tracemalloc peak memory, and compares against a saved
+JSON baseline so regressions fail the run. By default the results are gated
+against bench_baseline.json next to this file; re-save it with
+--save-baseline JEE_Benchmark/bench_baseline.json after an intended change or
+when moving to different hardware.
+
+Run from the repository root: python -m JEE_Benchmark.bench_harness
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from JEE_Benchmark.jee_benchmark import LLMBenchmark, MockProvider, compare_results
+from data.Marks_Web_Scraping.page_parser import extract_question_links, parse_question_page
+
+DEFAULT_SIZES = [1000, 10000]
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+# Small absolute allowance so sub-megabyte peaks do not fail on allocator noise.
+MEMORY_SLACK_MB = 0.25
+MIN_SAMPLE_SECONDS = 0.1
+
+WORDS = ("resistance wire metre-bridge balance point mirror focal length particle mass string "
+         "acceleration velocity $2 Omega$ $x<f$ mathrm{~cm} frictionless horizontal surface").split()
+
+RESPONSE_TEMPLATES = [
+    "After analyzing the problem, I believe the answer is {opt}.",
+    "Step 1: compute the balance.\nStep 2: compare.\n**Answer:** {opt}",
+    "Option {opt} is correct because the other values do not satisfy the constraint.",
+    "We get x = 2f, so ({opt}) follows. Option A is wrong, option C is wrong.",
+    "The derivation gives {text}. Therefore {opt}) is the right choice.",
+    "{text} {text} {text}",
+]
+
+
+def synthetic_questions(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    questions = []
+    for i in range(1, n + 1):
+        questions.append({
+            "question_number": i,
+            "question_text": " ".join(rng.choice(WORDS) for _ in range(rng.randint(20, 80))),
+            "options": {opt: " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 6))) for opt in "ABCD"},
+            "selected_answer": rng.choice("ABCD"),
+            "page_number": 1 + i // 50
+        })
+    return questions
+
+
+def synthetic_responses(n: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    responses = []
+    for _ in range(n):
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(10, 60)))
+        responses.append(rng.choice(RESPONSE_TEMPLATES).format(opt=rng.choice("ABCD"), text=text)[:500])
+    return responses
+
+
+def synthetic_results(questions: List[Dict[str, Any]], models: int, seed: int = 0) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    results_list = []
+    for m in range(models):
+        details = []
+        for q in questions:
+            answer = rng.choice("ABCD")
+            details.append({
+                "question_number": q["question_number"],
+                "correct_answer": q["selected_answer"],
+                "model_answer": answer,
+                "is_correct": answer == q["selected_answer"],
+                "response_time": rng.random(),
+                "model_response": ""
+            })
+        correct = sum(1 for d in details if d["is_correct"])
+        results_list.append({
+            "model": f"model-{m}",
+            "total_questions": len(questions),
+            "correct_answers": correct,
+            "accuracy": correct / len(questions),
+            "avg_response_time": sum(d["response_time"] for d in details) / len(questions),
+            "detailed_results": details
+        })
+    return results_list
+
+
+def synthetic_pages(n: int, seed: int = 0) -> Tuple[str, List[Tuple[str, str]]]:
+    rng = random.Random(seed)
+    ids = [f"{rng.getrandbits(96):024x}" for _ in range(n)]
+    exam_page = "<html><body><nav>" + "".join(
+        f'<a href="https://getmarks.app/question/{qid}">Q{i}</a>\n' for i, qid in enumerate(ids)
+    ) + "</nav></body></html>"
+
+    pages = []
+    for qid in ids:
+        words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(20, 80)))
+        correct = rng.randrange(4)
+        options = "".join(
+            f'<div class="option-wrapper{" correct" if j == correct else ""}"><p>{rng.choice(WORDS)}</p></div>\n'
+            for j in range(4)
+        )
+        pages.append((qid, f'<html><body><div class="ques-text"><p>{words}</p>'
+                           f'<img src="https://cdn.getmarks.app/{qid}.png"></div>\n{options}'
+                           f'<button>Solution</button><div class="solution-text">{words}</div></body></html>'))
+    return exam_page, pages
+
+
+class Bench:
+    """A benchmark case. setup(n) builds inputs; run(state) returns per-item latencies in ns.
+
+    Cases that can only time the whole run return None and report no percentiles.
+    """
+
+    def __init__(self, name: str, setup: Callable[[int], Any], run: Callable[[Any], Optional[List[int]]],
+                 max_size: Optional[int] = None):
+        self.name = name
+        self.setup = setup
+        self.run = run
+        self.max_size = max_size
+
+
+def timed_each(func: Callable[[Any], Any], items: List[Any]) -> List[int]:
+    perf_counter_ns = time.perf_counter_ns
+    latencies = []
+    for item in items:
+        start = perf_counter_ns()
+        func(item)
+        latencies.append(perf_counter_ns() - start)
+    return latencies
+
+
+def write_bank(n: int) -> str:
+    fd, path = tempfile.mkstemp(suffix=".json", prefix="jee_bench_")
+    with os.fdopen(fd, 'w') as f:
+        json.dump(synthetic_questions(n), f)
+    return path
+
+
+def run_load_questions(path: str) -> None:
+    LLMBenchmark(path, "mock").load_questions()
+
+
+def run_mock_benchmark(path: str) -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        LLMBenchmark(path, "mock").run_benchmark()
+
+
+def run_scraper_loop(state: Tuple[str, List[Tuple[str, str]]]) -> List[int]:
+    exam_page, pages = state
+    question_links = extract_question_links(exam_page)
+    html_by_id = dict(pages)
+    return timed_each(lambda q: parse_question_page(q["id"], html_by_id[q["id"]]), question_links)
+
+
+def answer_question(question: Dict[str, Any]) -> None:
+    """One question through the mock pipeline: prompt, query, answer extraction."""
+    response, _ = _mock_benchmark.query_model(_mock_benchmark.format_prompt(question))
+    _mock_benchmark.extract_answer(response)
+
+
+def run_compare(results_list: List[Dict[str, Any]]) -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        compare_results(results_list)
+
+
+_mock_benchmark = LLMBenchmark("", "mock")
+
+BENCHES = [
+    Bench("format_prompt", synthetic_questions, lambda qs: timed_each(_mock_benchmark.format_prompt, qs)),
+    Bench("extract_answer", synthetic_responses, lambda rs: timed_each(_mock_benchmark.extract_answer, rs)),
+    Bench("load_questions", write_bank, run_load_questions),
+    Bench("question[mock]", synthetic_questions, lambda qs: timed_each(answer_question, qs)),
+    Bench("run_benchmark[mock]", write_bank, run_mock_benchmark),
+    # compare_results scans every model's results once per question, so it is quadratic in n.
+    Bench("compare_results", lambda n: synthetic_results(synthetic_questions(n), 3), run_compare, max_size=10000),
+    # Offline page_parser over saved-page HTML; the live scraper extracts through Selenium, which is not timed here.
+    Bench("scraper_parse", lambda n: synthetic_pages(n), run_scraper_loop, max_size=100000),
+]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(bench: Bench, n: int, repeat: int) -> Dict[str, Any]:
+    state = bench.setup(n)
+    try:
+        # An untimed warm-up run also decides how many runs make up one sample, so
+        # millisecond-scale cases are timed over at least MIN_SAMPLE_SECONDS.
+        start = time.perf_counter()
+        bench.run(state)
+        loops = max(1, math.ceil(MIN_SAMPLE_SECONDS / max(time.perf_counter() - start, 1e-9)))
+
+        durations = []
+        latencies = []
+        for _ in range(repeat):
+            gc.collect()
+            start = time.perf_counter()
+            for _ in range(loops):
+                item_latencies = bench.run(state)
+                if item_latencies:
+                    latencies.extend(item_latencies)
+            durations.append((time.perf_counter() - start) / loops)
+
+        # Memory is measured on a separate pass so tracemalloc does not skew the timings.
+        gc.collect()
+        tracemalloc.start()
+        bench.run(state)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        if isinstance(state, str) and os.path.exists(state):
+            os.remove(state)
+
+    # The gate uses the median run: a single lucky run makes best-of-N baselines too fast to match.
+    median = statistics.median(durations)
+    latencies_us = sorted(ns / 1000 for ns in latencies)
+
+    return {
+        "bench": bench.name,
+        "n": n,
+        "seconds": median,
+        "best_seconds": min(durations),
+        "throughput": n / median if median > 0 else 0.0,
+        # Per-item percentiles; None for cases that only time whole runs
+        "p50_us": percentile(latencies_us, 50) if latencies_us else None,
+        "p90_us": percentile(latencies_us, 90) if latencies_us else None,
+        "p99_us": percentile(latencies_us, 99) if latencies_us else None,
+        "peak_mb": peak / (1024 * 1024),
+    }
+
+
+def check_regressions(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]],
+                      threshold: float) -> List[str]:
+    previous = {(r["bench"], r["n"]): r for r in baseline}
+    failures = []
+    for result in results:
+        old = previous.get((result["bench"], result["n"]))
+        if not old:
+            continue
+        if result["throughput"] < old["throughput"] * (1 - threshold):
+            failures.append(f"{result['bench']}[n={result['n']}]: throughput "
+                            f"{old['throughput']:.0f}/s -> {result['throughput']:.0f}/s")
+        if result["peak_mb"] > old["peak_mb"] * (1 + threshold) + MEMORY_SLACK_MB:
+            failures.append(f"{result['bench']}[n={result['n']}]: peak memory "
+                            f"{old['peak_mb']:.2f}MB -> {result['peak_mb']:.2f}MB")
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="JEE harness benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Question bank sizes (e.g. 1000 10000 100000 1000000)")
+    parser.add_argument("--bench", nargs="+", choices=[b.name for b in BENCHES], help="Only run these benchmarks")
+    parser.add_argument("--repeat", type=int, default=7, help="Timed runs per case (median is reported)")
+    parser.add_argument("--no-cap", action="store_true", help="Ignore per-benchmark size caps")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Baseline JSON to compare against")
+    parser.add_argument("--no-baseline", action="store_true", help="Do not compare against a baseline")
+    parser.add_argument("--threshold", type=float, default=0.3,
+                        help="Allowed fractional regression in median throughput or peak memory")
+    parser.add_argument("--retries", type=int, default=2,
+                        help="Re-measure a case this many times before reporting it as a regression")
+    parser.add_argument("--save-baseline", help="Write these results as a new baseline JSON")
+    args = parser.parse_args(argv)
+
+    MockProvider.default_delay = 0.0
+
+    baseline = None
+    if args.baseline and not args.no_baseline:
+        # Read before --save-baseline can overwrite the same file
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)["results"]
+
+    print(f"{'Benchmark':<20} | {'n':>8} | {'items/s':>12} | {'p50 us':>9} | {'p90 us':>9} | "
+          f"{'p99 us':>9} | {'peak MB':>8}")
+    print("-" * 94)
+
+    results = []
+    for bench in BENCHES:
+        if args.bench and bench.name not in args.bench:
+            continue
+        for n in args.sizes:
+            if bench.max_size and n > bench.max_size and not args.no_cap:
+                print(f"{bench.name:<20} | {n:>8} | skipped (cap {bench.max_size}, use --no-cap)")
+                continue
+            result = measure(bench, n, args.repeat)
+            # A case only fails the gate if it regresses on every attempt; one noisy process is not a regression
+            for _ in range(args.retries):
+                if baseline is None or not check_regressions([result], baseline, args.threshold):
+                    break
+                result = measure(bench, n, args.repeat)
+            results.append(result)
+            percentiles = " | ".join(f"{result[key]:>9.1f}" if result[key] is not None else f"{'-':>9}"
+                                     for key in ("p50_us", "p90_us", "p99_us"))
+            print(f"{result['bench']:<20} | {n:>8} | {result['throughput']:>12.0f} | {percentiles} | "
+                  f"{result['peak_mb']:>8.2f}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump({"python": sys.version.split()[0], "results": results}, f, indent=2)
+        print(f"\nBaseline saved to {args.save_baseline}")
+
+    if baseline is not None:
+        failures = check_regressions(results, baseline, args.threshold)
+        if failures:
+            print(f"\nREGRESSIONS (threshold {args.threshold * 100:.0f}%):")
+            for failure in failures:
+                print(f"  {failure}")
+            return 1
+        print(f"\nNo regressions against {args.baseline}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for jee_benchmark.py based on `python -X importtime`
+
+Run from the repository root: python -m JEE_Benchmark.bench_startup
+"""
+
+import argparse
+import contextlib
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, Iterator, List, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(HERE)
+MODULE = "JEE_Benchmark.jee_benchmark"
+HEAVY_MODULES = ["google.generativeai", "requests", "grpc"]
+
+
+def parse_importtime(stderr: str) -> Tuple[int, Dict[str, int]]:
+    """Return total self-time in microseconds and cumulative time per top-level import."""
+    total_self = 0
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        total_self += int(self_us)
+        if not name.startswith("  "):
+            cumulative[name.strip()] = int(cumulative_us)
+    return total_self, cumulative
+
+
+def tree_command(tree_root: str, args: List[str]) -> Tuple[List[str], Dict[str, str]]:
+    """Command and environment that run jee_benchmark.py from tree_root the way that revision expects."""
+    with open(os.path.join(tree_root, "JEE_Benchmark", "jee_benchmark.py"), 'r') as f:
+        source = f.read()
+
+    env = dict(os.environ, PIP_NO_INDEX="1", PIP_DISABLE_PIP_VERSION_CHECK="1")
+    if "add_subparsers" not in source:
+        # Before the run/compare/rescore CLI existed, every caller paid for importing the module.
+        env["PYTHONPATH"] = os.path.join(tree_root, "JEE_Benchmark")
+        return ["-c", "import jee_benchmark"], env
+    if "from JEE_Benchmark." in source:
+        env["PYTHONPATH"] = tree_root
+        return ["-m", MODULE] + args, env
+    return [os.path.join(tree_root, "JEE_Benchmark", "jee_benchmark.py")] + args, env
+
+
+def run_path(tree_root: str, args: List[str], cwd: str) -> Tuple[float, int, Dict[str, int]]:
+    command, env = tree_command(tree_root, args)
+    start_time = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime"] + command,
+                          cwd=cwd, env=env, capture_output=True, text=True)
+    wall_time = time.perf_counter() - start_time
+    if proc.returncode != 0:
+        last_line = (proc.stderr.strip().splitlines() or ["no output"])[-1]
+        raise RuntimeError(f"failed: {last_line}")
+    total_self, cumulative = parse_importtime(proc.stderr)
+    return wall_time, total_self, cumulative
+
+
+def measure_path(tree_root: str, args: List[str], cwd: str, repeat: int) -> Dict[str, Any]:
+    wall_times, import_times = [], []
+    cumulative = {}
+    for _ in range(repeat):
+        wall_time, total_self, cumulative = run_path(tree_root, args, cwd)
+        wall_times.append(wall_time * 1000)
+        import_times.append(total_self / 1000)
+    return {
+        "wall_ms": statistics.median(wall_times),
+        "import_ms": statistics.median(import_times),
+        "heavy": [m for m in HEAVY_MODULES if m in cumulative],
+        "cumulative": cumulative,
+    }
+
+
+@contextlib.contextmanager
+def reference_tree(revision: str, tmp_dir: str) -> Iterator[str]:
+    """Check out revision into a temporary git worktree."""
+    tree_root = os.path.join(tmp_dir, "reference")
+    subprocess.run(["git", "-C", REPO_ROOT, "worktree", "add", "--detach", tree_root, revision],
+                   check=True, capture_output=True)
+    try:
+        yield tree_root
+    finally:
+        subprocess.run(["git", "-C", REPO_ROOT, "worktree", "remove", "--force", tree_root],
+                       capture_output=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure jee_benchmark.py cold-start time")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per path (median is reported)")
+    parser.add_argument("--top", type=int, default=5, help="Slowest top-level imports to show per path")
+    parser.add_argument("--reference", metavar="REV",
+                        help="Also time this git revision (e.g. the commit before lazy providers) for before/after")
+    args = parser.parse_args()
+
+    results_dir = os.path.join(HERE, "results")
+    questions_file = os.path.join(HERE, "jee_sample.json")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_dir = os.path.join(tmp_dir, "output")
+        paths = {
+            "compare": ["--output-dir", results_dir, "compare"],
+            "rescore": ["--output-dir", results_dir, "rescore"],
+            "mock": ["--questions", questions_file, "--output-dir", output_dir,
+                     "run", "--models", "mock", "--mock-delay", "0"],
+        }
+
+        current = {name: measure_path(REPO_ROOT, path_args, tmp_dir, args.repeat)
+                   for name, path_args in paths.items()}
+
+        before = {}
+        if args.reference:
+            with reference_tree(args.reference, tmp_dir) as tree_root:
+                for name, path_args in paths.items():
+                    try:
+                        before[name] = measure_path(tree_root, path_args, tmp_dir, args.repeat)
+                    except RuntimeError as e:
+                        before[name] = {"error": str(e)}
+
+    if args.reference:
+        print(f"Reference: {args.reference} -> working tree (median of {args.repeat} runs)")
+        print(f"{'Path':<10} | {'Wall before':>11} | {'Wall after':>10} | {'Imports before':>14} | "
+              f"{'Imports after':>13} | {'Change':>8}")
+        print("-" * 84)
+        for name, after in current.items():
+            old = before[name]
+            if "error" in old:
+                print(f"{name:<10} | {'-':>11} | {after['wall_ms']:>8.1f}ms | {'-':>14} | "
+                      f"{after['import_ms']:>11.1f}ms | reference {old['error']}")
+                continue
+            change = (after["import_ms"] - old["import_ms"]) / old["import_ms"] * 100 if old["import_ms"] else 0.0
+            print(f"{name:<10} | {old['wall_ms']:>9.1f}ms | {after['wall_ms']:>8.1f}ms | {old['import_ms']:>12.1f}ms | "
+                  f"{after['import_ms']:>11.1f}ms | {change:>+7.1f}%")
+        print()
+
+    print(f"{'Path':<10} | {'Wall (ms)':<10} | {'Imports (ms)':<12} | Heavy modules loaded")
+    print("-" * 70)
+    for name, result in current.items():
+        print(f"{name:<10} | {result['wall_ms']:<10.1f} | {result['import_ms']:<12.1f} | "
+              f"{', '.join(result['heavy']) or 'none'}")
+
+    for name, result in current.items():
+        print(f"\nSlowest top-level imports ({name}):")
+        imports = sorted(result["cumulative"].items(), key=lambda x: x[1], reverse=True)[:args.top]
+        for module, cumulative_us in imports:
+            print(f"  {module:<30} {cumulative_us / 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""
+Columnar binary results store for JEE benchmark runs.
+
+Each field of a detailed result is kept in its own fixed-width column file so
+that loads can mmap the columns and only touch the rows they need. Response
+text is zlib-compressed per row into a separate blob file.
+"""
+
+import json
+import mmap
+import os
+import sys
+import time
+import zlib
+from array import array
+from typing import Any, Dict, Iterable, List, Optional
+
+# Answer columns hold an index into meta["answer_values"], so any JSON value
+# (None, "P", "Error", ...) round-trips; the common options get the low codes.
+DEFAULT_ANSWER_VALUES = ["A", "B", "C", "D", "Error"]
+MAX_ANSWER_VALUES = 256
+
+# Non-negative int question numbers are stored as-is; anything else ("unknown",
+# "7", None) is stored as -1 - its index into meta["question_values"].
+MAX_QUESTION_NUMBER = 2 ** 31 - 1
+
+COLUMNS = {
+    "question_id": "i",
+    "model_id": "H",
+    "answer": "B",
+    "correct_answer": "B",
+    "is_correct": "B",
+    "latency": "f",
+    "response_offset": "Q",
+    "response_length": "I",
+}
+
+META_FILE = "meta.json"
+BLOB_FILE = "responses.blob"
+
+
+class ResultsStore:
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+        self.meta = {"byteorder": sys.byteorder, "rows": 0, "models": [],
+                     "answer_values": list(DEFAULT_ANSWER_VALUES), "question_values": []}
+        meta_file = os.path.join(path, META_FILE)
+        if os.path.exists(meta_file):
+            with open(meta_file, 'r') as f:
+                self.meta = json.load(f)
+        self._answer_codes = {json.dumps(value): code for code, value in enumerate(self.meta["answer_values"])}
+        self._question_codes = {json.dumps(value): -1 - index
+                                for index, value in enumerate(self.meta["question_values"])}
+
+        self._maps = {}
+        self._views = {}
+
+    @property
+    def rows(self) -> int:
+        return self.meta["rows"]
+
+    @property
+    def models(self) -> List[Dict[str, Any]]:
+        return self.meta["models"]
+
+    def run_ids(self, models: Optional[Iterable[str]] = None, latest: bool = True) -> List[int]:
+        """Ids (indices into meta["models"]) of the stored runs of models, oldest first.
+
+        Every run and import appends a new run, so by default only the newest run
+        of each model is returned.
+        """
+        names = set(models) if models is not None else None
+        run_ids = [i for i, run in enumerate(self.models) if names is None or run["model"] in names]
+        if latest:
+            newest = {self.models[i]["model"]: i for i in run_ids}
+            run_ids = sorted(newest.values())
+        return run_ids
+
+    def encode_answer(self, answer: Any) -> int:
+        """Code for answer in the answer columns, adding it to the value dictionary if new."""
+        key = json.dumps(answer)
+        code = self._answer_codes.get(key)
+        if code is None:
+            code = len(self.meta["answer_values"])
+            if code >= MAX_ANSWER_VALUES:
+                raise ValueError(f"More than {MAX_ANSWER_VALUES} distinct answer values in {self.path}")
+            self.meta["answer_values"].append(answer)
+            self._answer_codes[key] = code
+        return code
+
+    def decode_answer(self, code: int) -> Any:
+        return self.meta["answer_values"][code]
+
+    def encode_question(self, question_number: Any, add: bool = True) -> Optional[int]:
+        """Code for question_number in the question_id column; None if unknown and add is False."""
+        if type(question_number) is int and 0 <= question_number <= MAX_QUESTION_NUMBER:
+            return question_number
+        key = json.dumps(question_number)
+        code = self._question_codes.get(key)
+        if code is None and add:
+            code = -1 - len(self.meta["question_values"])
+            self.meta["question_values"].append(question_number)
+            self._question_codes[key] = code
+        return code
+
+    def decode_question(self, code: int) -> Any:
+        return code if code >= 0 else self.meta["question_values"][-1 - code]
+
+    def _column_file(self, name: str) -> str:
+        return os.path.join(self.path, f"{name}.bin")
+
+    def close(self) -> None:
+        for view in self._views.values():
+            view.release()
+        for mm in self._maps.values():
+            mm.close()
+        self._views = {}
+        self._maps = {}
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def column(self, name: str) -> Any:
+        """Return a read-only, mmap-backed view of a column (an array for foreign byte order)."""
+        if name in self._views:
+            return self._views[name]
+
+        typecode = COLUMNS[name]
+        nbytes = self.rows * array(typecode).itemsize
+        if nbytes == 0:
+            return array(typecode)
+
+        with open(self._column_file(name), 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self.meta["byteorder"] != sys.byteorder:
+            values = array(typecode, mm[:nbytes])
+            values.byteswap()
+            mm.close()
+            self._views[name] = values
+            return values
+
+        self._maps[name] = mm
+        self._views[name] = memoryview(mm)[:nbytes].cast(typecode)
+        return self._views[name]
+
+    def _truncate_to_committed(self) -> None:
+        # Rows past meta["rows"] belong to an interrupted append and are dropped.
+        for name, typecode in COLUMNS.items():
+            column_file = self._column_file(name)
+            if os.path.exists(column_file):
+                with open(column_file, 'r+b') as f:
+                    f.truncate(self.rows * array(typecode).itemsize)
+
+        blob_file = os.path.join(self.path, BLOB_FILE)
+        if os.path.exists(blob_file):
+            with open(blob_file, 'r+b') as f:
+                f.truncate(self.meta.get("blob_size", 0))
+
+    def append(self, results: Dict[str, Any], created: Optional[str] = None) -> int:
+        """Append one model run (an LLMBenchmark.results dict) and return its run id."""
+        self.close()
+        self._truncate_to_committed()
+
+        if self.meta["byteorder"] != sys.byteorder:
+            raise ValueError(f"Cannot append to a {self.meta['byteorder']}-endian store on this machine")
+
+        model_id = len(self.models)
+        columns = {name: array(typecode) for name, typecode in COLUMNS.items()}
+        blob_size = self.meta.get("blob_size", 0)
+
+        with open(os.path.join(self.path, BLOB_FILE), 'ab') as blob:
+            for detail in results["detailed_results"]:
+                question_number = detail["question_number"]
+                compressed = zlib.compress(detail["model_response"].encode("utf-8"))
+                blob.write(compressed)
+
+                columns["question_id"].append(self.encode_question(question_number))
+                columns["model_id"].append(model_id)
+                columns["answer"].append(self.encode_answer(detail["model_answer"]))
+                columns["correct_answer"].append(self.encode_answer(detail["correct_answer"]))
+                columns["is_correct"].append(1 if detail["is_correct"] else 0)
+                columns["latency"].append(detail["response_time"])
+                columns["response_offset"].append(blob_size)
+                columns["response_length"].append(len(compressed))
+                blob_size += len(compressed)
+
+        for name, values in columns.items():
+            with open(self._column_file(name), 'ab') as f:
+                values.tofile(f)
+
+        self.meta["models"].append({
+            "model": results["model"],
+            "total_questions": results["total_questions"],
+            "created": created or time.strftime("%Y-%m-%dT%H:%M:%S"),
+            # Each append writes its rows contiguously, so filtered loads only scan this range
+            "row_start": self.rows,
+            "row_count": len(results["detailed_results"]),
+        })
+        self.meta["rows"] += len(results["detailed_results"])
+        self.meta["blob_size"] = blob_size
+
+        meta_file = os.path.join(self.path, META_FILE)
+        with open(meta_file + ".tmp", 'w') as f:
+            json.dump(self.meta, f)
+        os.replace(meta_file + ".tmp", meta_file)
+
+        return model_id
+
+    def select(self, models: Optional[Iterable[str]] = None,
+               question_numbers: Optional[Iterable[Any]] = None,
+               correct: Optional[bool] = None, latest: bool = True) -> List[int]:
+        """Return row indices matching every given filter, scanning only the selected runs' rows."""
+
+        question_set = None
+        if question_numbers is not None:
+            question_set = {self.encode_question(q, add=False) for q in question_numbers} - {None}
+
+        question_col = self.column("question_id")
+        correct_col = self.column("is_correct")
+
+        rows = []
+        for run_id in self.run_ids(models, latest):
+            start = self.models[run_id]["row_start"]
+            run_rows = range(start, start + self.models[run_id]["row_count"])
+            if question_set is None and correct is None:
+                rows.extend(run_rows)
+                continue
+            for i in run_rows:
+                if question_set is not None and question_col[i] not in question_set:
+                    continue
+                if correct is not None and bool(correct_col[i]) != correct:
+                    continue
+                rows.append(i)
+        return rows
+
+    def response(self, row: int) -> str:
+        offset = self.column("response_offset")[row]
+        length = self.column("response_length")[row]
+        with open(os.path.join(self.path, BLOB_FILE), 'rb') as f:
+            f.seek(offset)
+            return zlib.decompress(f.read(length)).decode("utf-8")
+
+    def load(self, models: Optional[Iterable[str]] = None,
+             question_numbers: Optional[Iterable[Any]] = None,
+             with_responses: bool = True, latest: bool = True) -> List[Dict[str, Any]]:
+        """Rebuild results dicts in the legacy JSON layout for the selected rows, one per run id."""
+        rows = self.select(models, question_numbers, latest=latest)
+
+        cols = {name: self.column(name) for name in COLUMNS}
+        # Seeded from the run list so runs without any rows are still returned
+        by_model = {}
+        for model_id in self.run_ids(models, latest):
+            by_model[model_id] = {
+                "model": self.models[model_id]["model"],
+                "total_questions": self.models[model_id]["total_questions"],
+                "correct_answers": 0,
+                "accuracy": 0.0,
+                "avg_response_time": 0.0,
+                "detailed_results": []
+            }
+
+        blob = open(os.path.join(self.path, BLOB_FILE), 'rb') if with_responses and rows else None
+        try:
+            for i in rows:
+                model_id = cols["model_id"][i]
+
+                response = ""
+                if blob is not None:
+                    blob.seek(cols["response_offset"][i])
+                    response = zlib.decompress(blob.read(cols["response_length"][i])).decode("utf-8")
+
+                by_model[model_id]["detailed_results"].append({
+                    "question_number": self.decode_question(cols["question_id"][i]),
+                    "correct_answer": self.decode_answer(cols["correct_answer"][i]),
+                    "model_answer": self.decode_answer(cols["answer"][i]),
+                    "is_correct": bool(cols["is_correct"][i]),
+                    "response_time": cols["latency"][i],
+                    "model_response": response
+                })
+        finally:
+            if blob is not None:
+                blob.close()
+
+        for results in by_model.values():
+            details = results["detailed_results"]
+            if question_numbers is not None:
+                # Scores for a question subset are over the questions actually selected
+                results["total_questions"] = len(details)
+            results["correct_answers"] = sum(1 for d in details if d["is_correct"])
+            if results["total_questions"] > 0:
+                results["accuracy"] = results["correct_answers"] / results["total_questions"]
+                results["avg_response_time"] = sum(d["response_time"] for d in details) / results["total_questions"]
+
+        return [by_model[model_id] for model_id in sorted(by_model)]
+
+    def export_json(self, output_dir: str, indent: Optional[int] = 2, latest: bool = True) -> List[str]:
+        """Write <model>_results.json for the latest run of each model, matching the old save_results output.
+
+        With latest=False every run is written as <model>_run<id>_results.json.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        written = []
+        for run_id, results in zip(self.run_ids(latest=latest), self.load(latest=latest)):
+            suffix = "" if latest else f"_run{run_id}"
+            output_file = os.path.join(output_dir, f"{results['model'].replace('/', '-')}{suffix}_results.json")
+            with open(output_file, 'w') as f:
+                json.dump(results, f, indent=indent)
+            written.append(output_file)
+        return written
@@ -0,0 +1,143 @@
+"""
+Tests for the columnar results store.
+
+Run from the repository root: python -m unittest JEE_Benchmark.test_results_store
+"""
+
+import glob
+import json
+import os
+import tempfile
+import unittest
+
+from JEE_Benchmark.results_store import COLUMNS, MAX_ANSWER_VALUES, ResultsStore
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def detail(question_number, answer, correct_answer, response_time=0.25, response=""):
+    return {
+        "question_number": question_number,
+        "correct_answer": correct_answer,
+        "model_answer": answer,
+        "is_correct": answer == correct_answer,
+        "response_time": response_time,
+        "model_response": response or f"The answer is {answer}",
+    }
+
+
+def run(model, details, total_questions=None):
+    correct = sum(1 for d in details if d["is_correct"])
+    total = len(details) if total_questions is None else total_questions
+    return {
+        "model": model,
+        "total_questions": total,
+        "correct_answers": correct,
+        "accuracy": correct / total if total else 0.0,
+        "avg_response_time": sum(d["response_time"] for d in details) / total if total else 0.0,
+        "detailed_results": details,
+    }
+
+
+class ResultsStoreTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        self.path = os.path.join(self.root, "store")
+
+    def assertResultsEqual(self, actual, expected):
+        self.assertEqual(len(actual["detailed_results"]), len(expected["detailed_results"]))
+        for got, want in zip(actual["detailed_results"], expected["detailed_results"]):
+            # Latencies are stored as float32
+            self.assertAlmostEqual(got.pop("response_time"), want["response_time"], places=5)
+            self.assertEqual(got, {k: v for k, v in want.items() if k != "response_time"})
+        for key in ("model", "total_questions", "correct_answers"):
+            self.assertEqual(actual[key], expected[key])
+        self.assertAlmostEqual(actual["accuracy"], expected["accuracy"])
+
+    def test_import_export_round_trip(self):
+        expected = []
+        for result_file in sorted(glob.glob(os.path.join(RESULTS_DIR, "*_results.json"))):
+            if os.path.basename(result_file) == "combined_results.json":
+                continue
+            with open(result_file, 'r') as f:
+                expected.append(json.load(f))
+        # Cases the saved results do not cover: string question numbers and an empty run
+        expected.append(run("edge", [detail("7", "P", None), detail("unknown", "Error", "A")]))
+        expected.append(run("empty", []))
+
+        with ResultsStore(self.path) as store:
+            for results in expected:
+                store.append(results)
+
+        export_dir = os.path.join(self.root, "export")
+        with ResultsStore(self.path) as store:
+            written = store.export_json(export_dir)
+        self.assertEqual(len(written), len(expected))
+
+        for results in expected:
+            with open(os.path.join(export_dir, f"{results['model']}_results.json"), 'r') as f:
+                self.assertResultsEqual(json.load(f), results)
+
+    def test_interrupted_append_is_truncated(self):
+        first = run("a", [detail(1, "A", "A"), detail(2, "B", "C")])
+        second = run("b", [detail(1, "D", "D")])
+
+        with ResultsStore(self.path) as store:
+            store.append(first)
+
+        # An append that died before meta.json was replaced leaves trailing bytes behind
+        for file_name in [f"{name}.bin" for name in COLUMNS] + ["responses.blob"]:
+            with open(os.path.join(self.path, file_name), 'ab') as f:
+                f.write(b"\xff" * 13)
+
+        with ResultsStore(self.path) as store:
+            store.append(second)
+            self.assertEqual(store.rows, 3)
+
+        with ResultsStore(self.path) as store:
+            loaded = store.load()
+        self.assertResultsEqual(loaded[0], first)
+        self.assertResultsEqual(loaded[1], second)
+
+    def test_filtered_load_scoring(self):
+        with ResultsStore(self.path) as store:
+            store.append(run("a", [detail(1, "A", "A"), detail(2, "B", "C"), detail(3, "D", "D")], 10))
+            store.append(run("b", [detail(1, "C", "A"), detail(2, "C", "C"), detail(3, "B", "D")], 10))
+
+            (a,) = store.load(models=["a"])
+            self.assertEqual((a["correct_answers"], a["total_questions"]), (2, 10))
+            self.assertAlmostEqual(a["accuracy"], 0.2)
+
+            # A question filter scores over the selected questions only
+            results = store.load(question_numbers=[2, 3])
+            self.assertEqual([r["model"] for r in results], ["a", "b"])
+            self.assertEqual([(r["correct_answers"], r["total_questions"]) for r in results], [(1, 2), (1, 2)])
+            self.assertAlmostEqual(results[0]["accuracy"], 0.5)
+
+            self.assertEqual(store.select(models=["b"], correct=True), [4])
+
+    def test_latest_run_per_model(self):
+        with ResultsStore(self.path) as store:
+            store.append(run("a", [detail(1, "A", "B")]))
+            store.append(run("a", [detail(1, "B", "B")]))
+
+            self.assertEqual(store.run_ids(), [1])
+            self.assertEqual([r["correct_answers"] for r in store.load()], [1])
+            self.assertEqual([r["correct_answers"] for r in store.load(latest=False)], [0, 1])
+
+    def test_answer_value_limit(self):
+        with ResultsStore(self.path) as store:
+            # Seeded values plus new ones fill the 256 one-byte codes
+            new_values = MAX_ANSWER_VALUES - len(store.meta["answer_values"])
+            store.append(run("full", [detail(i, f"v{i}", "A") for i in range(new_values)]))
+
+            with self.assertRaises(ValueError):
+                store.append(run("over", [detail(1, "one too many", "A")]))
+
+            self.assertEqual([r["model"] for r in store.load()], ["full"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,234 @@
+"""
+Opt-in span timing, sampling, cProfile and tracemalloc hooks.
+
+Instrumented code uses the module-level `tracer`:
+
+    with tracer.question(question_number):
+        with tracer.span("format_prompt"):
+            ...
+
+While the tracer is disabled span() returns a shared no-op context manager, so
+the hooks can stay in production code paths. cProfile, pstats, random and
+tracemalloc are only imported once the matching option is turned on.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start", "mem_start")
+
+    def __init__(self, tracer: "Tracer", name: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        tracemalloc = self.tracer._tracemalloc
+        self.mem_start = tracemalloc.get_traced_memory()[0] if tracemalloc else 0
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        tracemalloc = self.tracer._tracemalloc
+        allocated = tracemalloc.get_traced_memory()[0] - self.mem_start if tracemalloc else 0
+        self.tracer._record(self.name, self.start, end - self.start, allocated, self.args)
+        return False
+
+
+class _QuestionSpan(_Span):
+    __slots__ = ()
+
+    def __exit__(self, *exc):
+        super().__exit__(*exc)
+        # Spans outside a question are always written to the trace
+        self.tracer._local.sampled = True
+        return False
+
+
+class _ProfileSpan:
+    """Profiles the calling thread; cProfile never sees work done on other threads."""
+
+    __slots__ = ("tracer", "profiler")
+
+    def __init__(self, tracer: "Tracer"):
+        self.tracer = tracer
+
+    def __enter__(self):
+        import cProfile
+
+        self.profiler = cProfile.Profile()
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.disable()
+        with self.tracer._lock:
+            self.tracer._profiles.append(self.profiler)
+        return False
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.trace_file = None
+        self.sample_rate = 1.0
+        self.memory = False
+        self.profile = False
+
+        self._tracemalloc = None
+        self._random = None
+        self._profiles = []
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._events: List[Dict[str, Any]] = []
+        self._stats: Dict[str, List[int]] = {}
+        self._origin = time.perf_counter_ns()
+        self._pid = os.getpid()
+
+    def configure(self, trace_file: Optional[str] = None, sample_rate: float = 1.0,
+                  profile: bool = False, memory: bool = False) -> None:
+        """Enable tracing. Spans are aggregated for every question; trace events only for sampled ones."""
+        self.enabled = True
+        self.trace_file = trace_file
+        self.sample_rate = sample_rate
+        self.memory = memory
+        self.profile = profile
+        self._origin = time.perf_counter_ns()
+
+        if sample_rate < 1.0:
+            import random
+            self._random = random.random
+        if memory:
+            # tracemalloc counts allocations process-wide, so per-stage deltas assume one working thread
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            self._tracemalloc = tracemalloc
+
+    def span(self, name: str, **args) -> Any:
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, args)
+
+    def question(self, question_id: Any) -> Any:
+        """Span around one question; decides whether its nested spans are written to the trace."""
+        if not self.enabled:
+            return _NULL_SPAN
+        self._local.sampled = self._random is None or self._random() < self.sample_rate
+        return _QuestionSpan(self, "question", {"question": question_id})
+
+    def profiled(self) -> Any:
+        """Run cProfile on the calling thread for the duration of the block when --profile is on.
+
+        Wrap the code of the one thread doing the work (Python 3.12+ allows only one
+        active profiler per process); profiles from every block are merged in finish().
+        """
+        if not (self.enabled and self.profile):
+            return _NULL_SPAN
+        return _ProfileSpan(self)
+
+    def _record(self, name: str, start: int, duration: int, allocated: int, args: Dict[str, Any]) -> None:
+        sampled = getattr(self._local, "sampled", True)
+        with self._lock:
+            stats = self._stats.setdefault(name, [0, 0, 0])
+            stats[0] += 1
+            stats[1] += duration
+            stats[2] += allocated
+            if sampled and self.trace_file:
+                event = {
+                    "name": name,
+                    "ph": "X",
+                    "ts": (start - self._origin) / 1000,
+                    "dur": duration / 1000,
+                    "pid": self._pid,
+                    "tid": threading.get_ident(),
+                }
+                if args or self.memory:
+                    event["args"] = dict(args, allocated_bytes=allocated) if self.memory else args
+                self._events.append(event)
+
+    def summary(self) -> str:
+        lines = [f"{'Stage':<24} | {'Calls':>7} | {'Total ms':>10} | {'Mean ms':>9} | {'Alloc KB':>10}",
+                 "-" * 72]
+        for name, (count, total_ns, allocated) in sorted(self._stats.items(), key=lambda x: x[1][1], reverse=True):
+            alloc = f"{allocated / 1024:>10.1f}" if self.memory else f"{'-':>10}"
+            lines.append(f"{name:<24} | {count:>7} | {total_ns / 1e6:>10.2f} | "
+                         f"{total_ns / 1e6 / count:>9.3f} | {alloc}")
+        if self._tracemalloc and self._tracemalloc.is_tracing():
+            current, peak = self._tracemalloc.get_traced_memory()
+            lines.append(f"Traced memory: current {current / 1024 / 1024:.2f}MB, peak {peak / 1024 / 1024:.2f}MB")
+        return "\n".join(lines)
+
+    def finish(self) -> None:
+        """Stop profilers, write the trace and .prof files and print the summary table."""
+        if not self.enabled:
+            return
+
+        print("\n" + "=" * 72)
+        print("TRACE SUMMARY".center(72))
+        print("=" * 72)
+        print(self.summary())
+
+        if self.trace_file:
+            os.makedirs(os.path.dirname(self.trace_file) or ".", exist_ok=True)
+            with open(self.trace_file, 'w') as f:
+                json.dump({"traceEvents": self._events, "displayTimeUnit": "ms"}, f)
+            print(f"Chrome trace saved to {self.trace_file} (open in chrome://tracing or Perfetto)")
+
+        if self._profiles:
+            import io
+            import pstats
+
+            prof_file = os.path.splitext(self.trace_file or "profile")[0] + ".prof"
+            out = io.StringIO()
+            stats = pstats.Stats(self._profiles[0], stream=out)
+            for profiler in self._profiles[1:]:
+                stats.add(profiler)
+            stats.dump_stats(prof_file)
+            stats.sort_stats("cumulative").print_stats(15)
+            print(out.getvalue())
+            print(f"cProfile stats saved to {prof_file}")
+
+        if self._tracemalloc:
+            self._tracemalloc.stop()
+            self._tracemalloc = None
+
+        self.enabled = False
+
+
+def add_tracing_arguments(parser: Any) -> None:
+    parser.add_argument("--trace", metavar="FILE", help="Enable tracing and write a Chrome trace JSON to FILE")
+    parser.add_argument("--trace-sample", type=float, default=1.0,
+                        help="Fraction of questions whose spans are written to the trace")
+    parser.add_argument("--profile", action="store_true",
+                        help="Run the worker thread under cProfile (implies tracing; single worker only)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Record tracemalloc allocations per stage (implies tracing; single worker only)")
+
+
+def configure_from_args(args: Any) -> None:
+    if args.trace or args.profile or args.trace_memory:
+        tracer.configure(args.trace, args.trace_sample, args.profile, args.trace_memory)
+
+
+tracer = Tracer()
@@ -1,27 +1,27 @@
-import time
-import json
-import os
+"""
+Tk front end for the GetMarks scraper.
+
+Usage: python V1.py
+   or, from the repository root: python -m data.Marks_Web_Scraping.V1
+"""
+
+import queue
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
-from webdriver_manager.chrome import ChromeDriverManager
 import threading
 import logging
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[logging.FileHandler("scraper_log.txt"), logging.StreamHandler()]
-)
+if __package__:
+    from .scraper_core import ScraperCore, setup_logging
+else:
+    from scraper_core import ScraperCore, setup_logging
+
 logger = logging.getLogger(__name__)
 
+# The worker thread never touches Tk; events are drained on the Tk thread at most this often.
+POLL_INTERVAL_MS = 50
+MAX_EVENTS_PER_POLL = 500
+
 
 class GetMarksScraper:
     def __init__(self, root):
@@ -30,12 +30,14 @@ class GetMarksScraper:
         self.root.geometry("600x500")
         self.root.resizable(True, True)
 
-        self.driver = None
+        self.core = None
+        self.events = queue.Queue()
         self.is_scraping = False
         self.scrape_thread = None
 
         # Create the UI
         self.create_ui()
+        self.root.after(POLL_INTERVAL_MS, self.poll_events)
 
     def create_ui(self):
         # Create a main frame
@@ -116,13 +118,49 @@ class GetMarksScraper:
 
     def update_status(self, message):
         self.status_var.set(message)
-        logger.info(message)
 
     def update_progress(self, current, total):
         if total > 0:
             progress = (current / total) * 100
             self.progress_var.set(progress)
 
+    def poll_events(self):
+        """Apply queued scraper events on the Tk thread, repainting only the latest status/progress."""
+        status = None
+        progress = None
+        finished = []
+
+        for _ in range(MAX_EVENTS_PER_POLL):
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+
+            if event.kind == "status":
+                status = event.message
+            elif event.kind == "progress":
+                progress = (event.current, event.total)
+            else:
+                finished.append(event)
+
+        if status is not None:
+            self.update_status(status)
+        if progress is not None:
+            self.update_progress(*progress)
+
+        for event in finished:
+            if event.kind == "info":
+                messagebox.showinfo("No Questions", event.message)
+            elif event.kind == "error":
+                messagebox.showerror("Error", event.message)
+            elif event.kind == "done" and event.payload:
+                messagebox.showinfo("Success", event.message)
+
+        if self.is_scraping and self.scrape_thread and not self.scrape_thread.is_alive():
+            self.finish_scraping()
+
+        self.root.after(POLL_INTERVAL_MS, self.poll_events)
+
     def browse_output_file(self):
         filename = filedialog.asksaveasfilename(
             defaultextension=".json",
@@ -153,259 +191,31 @@ class GetMarksScraper:
         self.start_button.config(state=tk.DISABLED)
         self.stop_button.config(state=tk.NORMAL)
 
+        # Keep the browser visible, as before, so the user can watch the scrape
+        self.core = ScraperCore(username, password, self.events, headless=False)
+
         # Start scraping in a separate thread
-        self.scrape_thread = threading.Thread(target=self.run_scraping)
+        self.scrape_thread = threading.Thread(
+            target=self.run_scraping,
+            args=(url, self.exam_id_var.get(), self.output_file_var.get())
+        )
         self.scrape_thread.daemon = True
         self.scrape_thread.start()
 
-    def run_scraping(self):
+    def run_scraping(self, url, exam_id, output_file):
+        # Runs on the worker thread: only the core is touched here, never Tk widgets
         try:
-            self.update_status("Setting up Chrome browser...")
-
-            # Set up Chrome options
-            chrome_options = Options()
-            chrome_options.add_argument("--disable-notifications")
-            chrome_options.add_argument("--disable-popup-blocking")
-            chrome_options.add_argument("--window-size=1920,1080")
-
-            # Enable headless mode if needed
-            # chrome_options.add_argument("--headless")
-
-            # Initialize Chrome driver
-            self.update_status("Initializing Chrome driver...")
-            self.driver = webdriver.Chrome(
-                service=Service(ChromeDriverManager().install()),
-                options=chrome_options
-            )
-
-            # Login to GetMarks
-            self.login_to_getmarks()
-
-            # Navigate to exam page
-            self.navigate_to_exam()
-
-            # Extract questions
-            questions = self.extract_questions_data()
-
-            # Save to JSON file if we have questions
-            if questions:
-                output_file = self.output_file_var.get()
-                exam_id = self.exam_id_var.get()
-
-                with open(output_file, "w", encoding="utf-8") as f:
-                    json.dump({
-                        "exam_id": exam_id,
-                        "questions": questions
-                    }, f, ensure_ascii=False, indent=2)
-
-                self.update_status(f"Successfully saved {len(questions)} questions to {output_file}")
-                messagebox.showinfo("Success", f"Successfully saved {len(questions)} questions to {output_file}")
-            else:
-                self.update_status("No questions were extracted")
-
-        except Exception as e:
-            error_msg = f"Error during scraping: {e}"
-            logger.error(error_msg)
-            self.update_status("Error occurred")
-            messagebox.showerror("Error", error_msg)
-
+            self.core.scrape(url, exam_id, output_file)
         finally:
-            if self.driver:
-                try:
-                    self.driver.quit()
-                except:
-                    pass
-                self.driver = None
-
-            self.finish_scraping()
-
-    def login_to_getmarks(self):
-        """Log in to GetMarks using the provided credentials"""
-        try:
-            username = self.username_var.get()
-            password = self.password_var.get()
-
-            self.update_status("Logging in to GetMarks...")
-
-            # Navigate to login page
-            self.driver.get("https://getmarks.app/login")
-
-            # Wait for the login form to load
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.ID, "email"))
-            )
-
-            # Fill in login credentials
-            self.driver.find_element(By.ID, "email").send_keys(username)
-            self.driver.find_element(By.ID, "password").send_keys(password)
-
-            # Submit the login form
-            self.driver.find_element(By.XPATH, "//button[@type='submit']").click()
-
-            # Wait for login to complete
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, "//nav"))
-            )
-
-            self.update_status("Successfully logged in to GetMarks")
-
-        except Exception as e:
-            logger.error(f"Login failed: {e}")
-            raise Exception(f"Failed to log in to GetMarks: {e}")
-
-    def navigate_to_exam(self):
-        """Navigate to the exam page"""
-        try:
-            url = self.url_var.get()
-
-            self.update_status(f"Navigating to exam page: {url}")
-            self.driver.get(url)
-
-            # Wait for the page to load
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "body"))
-            )
-
-            self.update_status("Successfully loaded exam page")
-
-        except Exception as e:
-            logger.error(f"Navigation failed: {e}")
-            raise Exception(f"Failed to navigate to exam page: {e}")
+            self.core.close()
 
     def stop_scraping(self):
         if not self.is_scraping:
             return
 
-        self.is_scraping = False
+        self.core.stop()
         self.update_status("Stopping scraping... Please wait.")
 
-    def extract_questions_data(self):
-        """Extract question data from the current page"""
-        try:
-            current_url = self.driver.current_url
-            self.update_status(f"Extracting data from: {current_url}")
-
-            # Wait for questions to load
-            self.update_status("Waiting for questions to load...")
-            WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "a[href*='/question/']"))
-            )
-
-            # Get all question links
-            question_links = []
-            links = self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/question/']")
-
-            for link in links:
-                href = link.get_attribute("href")
-                if href and "/question/" in href:
-                    question_id = href.split("/")[-1]
-                    if not any(q.get("id") == question_id for q in question_links):
-                        question_links.append({
-                            "id": question_id,
-                            "url": href
-                        })
-
-            total_questions = len(question_links)
-            self.update_status(f"Found {total_questions} questions")
-
-            if total_questions == 0:
-                messagebox.showinfo("No Questions", "No questions found on this page.")
-                return []
-
-            # Process each question link
-            all_questions = []
-            for i, question in enumerate(question_links):
-                if not self.is_scraping:
-                    self.update_status("Scraping stopped by user")
-                    break
-
-                current_question = i + 1
-                self.update_status(f"Processing question {current_question}/{total_questions}: {question['id']}")
-                self.update_progress(current_question, total_questions)
-
-                # Navigate to the question page
-                self.driver.get(question["url"])
-
-                # Wait for question content to load
-                WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, ".ques-text, .question-content"))
-                )
-
-                # Extract question data
-                try:
-                    # Get question text
-                    question_text_element = self.driver.find_element(By.CSS_SELECTOR, ".ques-text, .question-content")
-                    question_text = question_text_element.get_attribute("innerHTML").strip()
-
-                    # Get options if available
-                    options = []
-                    try:
-                        option_elements = self.driver.find_elements(By.CSS_SELECTOR, ".option-wrapper, .option-item")
-                        for opt in option_elements:
-                            option_text = opt.get_attribute("innerHTML").strip()
-                            is_correct = "correct" in opt.get_attribute("class").lower()
-                            options.append({
-                                "text": option_text,
-                                "isCorrect": is_correct
-                            })
-                    except Exception as e:
-                        logger.warning(f"Error getting options: {e}")
-
-                    # Try to get solution
-                    solution_text = ""
-                    try:
-                        # Click solution button if it exists
-                        solution_btn = self.driver.find_element(By.XPATH, "//button[contains(text(), 'Solution')]")
-                        solution_btn.click()
-
-                        # Wait for solution to appear
-                        WebDriverWait(self.driver, 5).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, ".solution-text, .solution-content"))
-                        )
-
-                        solution_element = self.driver.find_element(By.CSS_SELECTOR,
-                                                                    ".solution-text, .solution-content")
-                        solution_text = solution_element.get_attribute("innerHTML").strip()
-                    except Exception as e:
-                        logger.warning(f"Error getting solution: {e}")
-
-                    # Add question data to results
-                    question_data = {
-                        "_id": question["id"],
-                        "question": {
-                            "text": question_text
-                        },
-                        "options": options,
-                        "solution": {
-                            "text": solution_text
-                        }
-                    }
-
-                    all_questions.append(question_data)
-
-                except Exception as e:
-                    error_msg = f"Error extracting data for question {question['id']}: {e}"
-                    logger.error(error_msg)
-
-                # Add a slight delay between questions
-                time.sleep(1)
-
-            return all_questions
-
-        except TimeoutException:
-            error_msg = "Timed out waiting for questions to load."
-            logger.error(error_msg)
-            self.update_status("Error: Timed out")
-            messagebox.showerror("Timeout Error", error_msg)
-            return []
-
-        except Exception as e:
-            error_msg = f"Error extracting questions data: {e}"
-            logger.error(error_msg)
-            self.update_status("Error occurred")
-            messagebox.showerror("Error", error_msg)
-            return []
-
     def finish_scraping(self):
         self.is_scraping = False
         self.start_button.config(state=tk.NORMAL)
@@ -415,18 +225,19 @@ class GetMarksScraper:
         if self.is_scraping:
             if not messagebox.askyesno("Confirm Exit", "Scraping is in progress. Are you sure you want to exit?"):
                 return
-            self.is_scraping = False
+            self.core.stop()
 
-        if self.driver:
-            try:
-                self.driver.quit()
-            except:
-                pass
+        if self.core:
+            self.core.close()
 
         self.root.destroy()
 
 
 if __name__ == "__main__":
+    listener = setup_logging()
     root = tk.Tk()
     app = GetMarksScraper(root)
-    root.mainloop()
\ No newline at end of file
+    try:
+        root.mainloop()
+    finally:
+        listener.stop()
\ No newline at end of file
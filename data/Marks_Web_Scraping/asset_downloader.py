@@ -0,0 +1,239 @@
+"""
+Download the images referenced by scraped question HTML and rewrite it to local paths.
+
+Assets are fetched concurrently through one pooled aiohttp session and stored
+under their SHA-256 content hash, so a figure reused across questions or exams
+is kept once. A manifest of URL -> file lets interrupted runs resume. Mirrors
+map URL prefixes (e.g. a CDN) to another server for fetching while the manifest
+and rewritten HTML keep the original URLs.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import html
+import json
+import logging
+import mimetypes
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+
+_TAG_RE = re.compile(r"<(?:img|source|embed|object|image|input)\b[^>]*>", re.IGNORECASE)
+_ATTR_RE = re.compile(r"(\s(?:src|srcset|data|href|xlink:href)\s*=\s*)(\"[^\"]*\"|'[^']*')", re.IGNORECASE)
+
+
+def _split_srcset(value: str) -> List[str]:
+    return [part.strip().split()[0] for part in value.split(",") if part.strip()]
+
+
+def _is_remote(url: str) -> bool:
+    return urlparse(url).scheme in ("http", "https")
+
+
+def extract_asset_urls(html_text: str, base_url: Optional[str] = None) -> List[str]:
+    """Return the unique absolute asset URLs referenced by html_text, in document order."""
+    urls = []
+    seen = set()
+    for tag in _TAG_RE.finditer(html_text):
+        for attr in _ATTR_RE.finditer(tag.group(0)):
+            value = html.unescape(attr.group(2)[1:-1])
+            name = attr.group(1).strip().rstrip("=").strip().lower()
+            candidates = _split_srcset(value) if name == "srcset" else [value]
+            for candidate in candidates:
+                url = urljoin(base_url, candidate) if base_url else candidate
+                if _is_remote(url) and url not in seen:
+                    seen.add(url)
+                    urls.append(url)
+    return urls
+
+
+def rewrite_html(html_text: str, local_paths: Dict[str, str], base_url: Optional[str] = None) -> str:
+    """Replace asset URLs that have a local copy with their local path."""
+
+    def local(value: str) -> str:
+        url = urljoin(base_url, value) if base_url else value
+        return local_paths.get(url, value)
+
+    def rewrite_attr(attr):
+        quote = attr.group(2)[0]
+        value = html.unescape(attr.group(2)[1:-1])
+        name = attr.group(1).strip().rstrip("=").strip().lower()
+        if name == "srcset":
+            parts = []
+            for part in value.split(","):
+                pieces = part.strip().split(None, 1)
+                if pieces:
+                    parts.append(" ".join([local(pieces[0])] + pieces[1:]))
+            new_value = ", ".join(parts)
+        else:
+            new_value = local(value)
+        if new_value == value:
+            return attr.group(0)
+        return f"{attr.group(1)}{quote}{html.escape(new_value, quote=True)}{quote}"
+
+    return _TAG_RE.sub(lambda tag: _ATTR_RE.sub(rewrite_attr, tag.group(0)), html_text)
+
+
+def parse_mirror(value: str) -> Tuple[str, str]:
+    """Parse a FROM=TO URL prefix mapping given on the command line."""
+    prefix, sep, target = value.partition("=")
+    if not (sep and prefix and target):
+        raise argparse.ArgumentTypeError(f"Expected FROM=TO, got {value!r}")
+    return prefix, target
+
+
+class AssetDownloader:
+    def __init__(self, asset_dir: str, concurrency: int = 8, timeout: float = 30.0, retries: int = 2,
+                 mirrors: Optional[Dict[str, str]] = None):
+        self.asset_dir = asset_dir
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.mirrors = mirrors or {}
+
+        os.makedirs(asset_dir, exist_ok=True)
+        self.manifest: Dict[str, str] = {}
+        manifest_file = os.path.join(asset_dir, MANIFEST_FILE)
+        if os.path.exists(manifest_file):
+            with open(manifest_file, 'r') as f:
+                self.manifest = json.load(f)
+
+    def save_manifest(self) -> None:
+        manifest_file = os.path.join(self.asset_dir, MANIFEST_FILE)
+        with open(manifest_file + ".tmp", 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(manifest_file + ".tmp", manifest_file)
+
+    def fetch_url(self, url: str) -> str:
+        """URL to download url from, after applying the longest matching mirror prefix."""
+        for prefix in sorted(self.mirrors, key=len, reverse=True):
+            if url.startswith(prefix):
+                return self.mirrors[prefix] + url[len(prefix):]
+        return url
+
+    def local_path(self, url: str) -> Optional[str]:
+        """Absolute path of the downloaded copy of url, if it exists."""
+        relative = self.manifest.get(url)
+        if relative and os.path.exists(os.path.join(self.asset_dir, relative)):
+            return os.path.join(self.asset_dir, relative)
+        return None
+
+    def _store(self, url: str, content: bytes, content_type: Optional[str]) -> str:
+        digest = hashlib.sha256(content).hexdigest()
+        ext = os.path.splitext(urlparse(url).path)[1].lower()
+        if not ext or len(ext) > 5:
+            ext = mimetypes.guess_extension((content_type or "").split(";")[0].strip()) or ""
+
+        relative = os.path.join(digest[:2], digest + ext)
+        path = os.path.join(self.asset_dir, relative)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path + ".part", 'wb') as f:
+                f.write(content)
+            os.replace(path + ".part", path)
+        return relative
+
+    async def _fetch(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, url: str) -> None:
+        async with semaphore:
+            for attempt in range(self.retries + 1):
+                try:
+                    async with session.get(self.fetch_url(url)) as response:
+                        response.raise_for_status()
+                        content = await response.read()
+                        self.manifest[url] = self._store(url, content, response.headers.get("Content-Type"))
+                        return
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    client_error = isinstance(e, aiohttp.ClientResponseError) and e.status < 500
+                    if attempt == self.retries or client_error:
+                        logger.warning(f"Failed to download {url}: {e}")
+                        return
+                    await asyncio.sleep(0.5 * 2 ** attempt)
+
+    async def download_all(self, urls: Iterable[str]) -> Dict[str, str]:
+        """Download every URL not already in the manifest; return url -> absolute local path."""
+        urls = list(dict.fromkeys(urls))
+        pending = [url for url in urls if not self.local_path(url)]
+
+        if pending:
+            logger.info(f"Downloading {len(pending)} assets ({len(urls) - len(pending)} already local)")
+            semaphore = asyncio.Semaphore(self.concurrency)
+            connector = aiohttp.TCPConnector(limit=self.concurrency)
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            try:
+                async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+                    await asyncio.gather(*(self._fetch(session, semaphore, url) for url in pending))
+            finally:
+                self.save_manifest()
+
+        return {url: self.local_path(url) for url in urls if self.local_path(url)}
+
+
+def _question_html_fields(question: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """The dicts holding innerHTML under a "text" key in a scraped question record."""
+    fields = [question.get("question") or {}, question.get("solution") or {}]
+    fields.extend(question.get("options") or [])
+    return [field for field in fields if isinstance(field.get("text"), str)]
+
+
+def localize_questions(questions: List[Dict[str, Any]], downloader: AssetDownloader,
+                       output_dir: str, base_url: Optional[str] = None) -> int:
+    """Download all assets in scraped questions and rewrite their HTML in place. Returns assets localized."""
+    urls = []
+    for question in questions:
+        for field in _question_html_fields(question):
+            urls.extend(extract_asset_urls(field["text"], base_url))
+
+    downloaded = asyncio.run(downloader.download_all(urls))
+    local_paths = {url: os.path.relpath(path, output_dir).replace(os.sep, "/") for url, path in downloaded.items()}
+
+    for question in questions:
+        for field in _question_html_fields(question):
+            field["text"] = rewrite_html(field["text"], local_paths, base_url)
+
+    return len(local_paths)
+
+
+def localize_exam_file(input_file: str, output_file: str, downloader: AssetDownloader,
+                       base_url: Optional[str] = None) -> int:
+    """Localize the assets of a scraped exam JSON file into output_file. Returns assets localized."""
+    with open(input_file, 'r', encoding="utf-8") as f:
+        exam = json.load(f)
+
+    count = localize_questions(exam["questions"], downloader,
+                               os.path.dirname(os.path.abspath(output_file)), base_url)
+
+    with open(output_file, "w", encoding="utf-8") as f:
+        json.dump(exam, f, ensure_ascii=False, indent=2)
+    return count
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    parser = argparse.ArgumentParser(description="Download question images and rewrite HTML to local copies")
+    parser.add_argument("input", help="Scraped exam JSON (output of the GetMarks scraper)")
+    parser.add_argument("--output", help="Rewritten JSON (default: <input>_offline.json)")
+    parser.add_argument("--asset-dir", default="assets", help="Content-addressed asset directory")
+    parser.add_argument("--base-url", default="https://getmarks.app/", help="Base URL for relative asset links")
+    parser.add_argument("--mirror", type=parse_mirror, action="append", default=[], metavar="FROM=TO",
+                        help="Fetch URLs starting with FROM from TO instead (repeatable)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Maximum parallel downloads")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    args = parser.parse_args()
+
+    output_file = args.output or os.path.splitext(args.input)[0] + "_offline.json"
+    downloader = AssetDownloader(args.asset_dir, args.concurrency, args.timeout, mirrors=dict(args.mirror))
+    count = localize_exam_file(args.input, output_file, downloader, args.base_url)
+    logger.info(f"Localized {count} assets; saved {output_file}")
+
+
+if __name__ == "__main__":
+    main()
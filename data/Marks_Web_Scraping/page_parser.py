@@ -0,0 +1,120 @@
+"""
+Offline parsing of saved GetMarks pages.
+
+Mirrors the CSS selectors used by scraper_core.ScraperCore so that saved HTML can be
+processed (and benchmarked) without a browser.
+"""
+
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Tuple
+
+QUESTION_CLASSES = ("ques-text", "question-content")
+OPTION_CLASSES = ("option-wrapper", "option-item")
+SOLUTION_CLASSES = ("solution-text", "solution-content")
+
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input",
+             "link", "meta", "param", "source", "track", "wbr"}
+
+
+class _InnerHTMLParser(HTMLParser):
+    """Collects question links and the innerHTML of question, option and solution elements."""
+
+    def __init__(self, html: str):
+        super().__init__(convert_charrefs=False)
+        self.html = html
+        self.line_offsets = [0]
+        for line in html.split("\n"):
+            self.line_offsets.append(self.line_offsets[-1] + len(line) + 1)
+
+        self.stack: List[Tuple[str, Optional[Tuple[str, int, str]]]] = []
+        self.links: List[str] = []
+        self.elements: Dict[str, List[Tuple[int, str, str]]] = {"question": [], "option": [], "solution": []}
+
+    def _offset(self) -> int:
+        line, column = self.getpos()
+        return self.line_offsets[line - 1] + column
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        href = attrs.get("href")
+        if tag == "a" and href and "/question/" in href:
+            self.links.append(href)
+
+        if tag in VOID_TAGS:
+            return
+
+        classes = (attrs.get("class") or "").split()
+        kind = None
+        if any(c in classes for c in QUESTION_CLASSES):
+            kind = "question"
+        elif any(c in classes for c in OPTION_CLASSES):
+            kind = "option"
+        elif any(c in classes for c in SOLUTION_CLASSES):
+            kind = "solution"
+
+        capture = None
+        if kind:
+            capture = (kind, self._offset() + len(self.get_starttag_text()), attrs.get("class") or "")
+        self.stack.append((tag, capture))
+
+    def handle_endtag(self, tag):
+        # Pop up to the matching open tag, tolerating unclosed children.
+        for depth in range(len(self.stack) - 1, -1, -1):
+            if self.stack[depth][0] == tag:
+                break
+        else:
+            return
+
+        end = self._offset()
+        while len(self.stack) > depth:
+            _, capture = self.stack.pop()
+            if capture:
+                kind, start, class_attr = capture
+                self.elements[kind].append((start, self.html[start:end].strip(), class_attr))
+
+    def close(self):
+        super().close()
+        # Nested matches close before their parents; restore document order like find_elements.
+        for matches in self.elements.values():
+            matches.sort()
+
+
+def extract_question_links(html: str) -> List[Dict[str, str]]:
+    """Return unique {"id", "url"} entries for every question link on an exam page."""
+    parser = _InnerHTMLParser(html)
+    parser.feed(html)
+    parser.close()
+
+    question_links = []
+    seen = set()
+    for href in parser.links:
+        question_id = href.split("/")[-1]
+        if question_id not in seen:
+            seen.add(question_id)
+            question_links.append({"id": question_id, "url": href})
+    return question_links
+
+
+def parse_question_page(question_id: str, html: str) -> Optional[Dict[str, Any]]:
+    """Build the same question record as ScraperCore.scrape_question from saved HTML."""
+    parser = _InnerHTMLParser(html)
+    parser.feed(html)
+    parser.close()
+
+    if not parser.elements["question"]:
+        return None
+
+    solution = parser.elements["solution"]
+    return {
+        "_id": question_id,
+        "question": {
+            "text": parser.elements["question"][0][1]
+        },
+        "options": [
+            {"text": text, "isCorrect": "correct" in class_attr.lower()}
+            for _, text, class_attr in parser.elements["option"]
+        ],
+        "solution": {
+            "text": solution[0][1] if solution else ""
+        }
+    }
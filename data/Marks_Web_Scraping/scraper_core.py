@@ -0,0 +1,484 @@
+"""
+Headless GetMarks scraping core.
+
+ScraperCore drives Selenium and reports progress as ScrapeEvent tuples on a
+queue instead of touching any GUI, so it can run on servers, in batches, or
+behind the Tk front end in V1.py.
+
+Usage: python scraper_core.py EXAM_URL ...
+   or, from the repository root: python -m data.Marks_Web_Scraping.scraper_core EXAM_URL ...
+
+The --trace/--profile options come from JEE_Benchmark.tracing and are only
+available when the repository root is importable (the second form).
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+from webdriver_manager.chrome import ChromeDriverManager
+
+try:
+    from JEE_Benchmark.tracing import add_tracing_arguments, configure_from_args, tracer
+except ImportError:
+    # Started as a script from this directory; tracing hooks become no-ops.
+    class _NoTracer:
+        def span(self, *args, **kwargs):
+            return contextlib.nullcontext()
+
+        question = profiled = span
+
+        def finish(self):
+            pass
+
+    tracer = _NoTracer()
+
+    def add_tracing_arguments(parser):
+        parser.set_defaults(trace=None, trace_sample=1.0, profile=False, trace_memory=False)
+
+    def configure_from_args(args):
+        pass
+
+logger = logging.getLogger(__name__)
+
+LOGIN_URL = "https://getmarks.app/login"
+
+
+class ScrapeEvent(NamedTuple):
+    kind: str  # "status", "progress", "info", "error" or "done"
+    exam_id: str
+    message: str = ""
+    current: int = 0
+    total: int = 0
+    payload: Any = None
+
+
+def setup_logging(log_file: str = "scraper_log.txt") -> logging.handlers.QueueListener:
+    """Route log records through a queue so file writes happen off the scraping threads."""
+    log_queue = queue.Queue()
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    handlers = [logging.FileHandler(log_file), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    listener = logging.handlers.QueueListener(log_queue, *handlers)
+    listener.start()
+    return listener
+
+
+class ScraperCore:
+    def __init__(self, username: str, password: str, events: "queue.Queue[ScrapeEvent]",
+                 headless: bool = True, question_delay: float = 1.0,
+                 stop_event: Optional[threading.Event] = None):
+        self.username = username
+        self.password = password
+        self.events = events
+        self.headless = headless
+        self.question_delay = question_delay
+        self.stop_event = stop_event or threading.Event()
+
+        self.driver = None
+        self.logged_in = False
+        self.exam_id = ""
+
+    def emit(self, kind: str, message: str = "", current: int = 0, total: int = 0, payload: Any = None) -> None:
+        self.events.put(ScrapeEvent(kind, self.exam_id, message, current, total, payload))
+
+    def update_status(self, message: str) -> None:
+        self.emit("status", message)
+        logger.info(f"[{self.exam_id}] {message}" if self.exam_id else message)
+
+    def stop(self) -> None:
+        self.stop_event.set()
+
+    def setup_driver(self) -> None:
+        self.update_status("Setting up Chrome browser...")
+
+        chrome_options = Options()
+        chrome_options.add_argument("--disable-notifications")
+        chrome_options.add_argument("--disable-popup-blocking")
+        chrome_options.add_argument("--window-size=1920,1080")
+        if self.headless:
+            chrome_options.add_argument("--headless=new")
+
+        self.update_status("Initializing Chrome driver...")
+        self.driver = webdriver.Chrome(
+            service=Service(ChromeDriverManager().install()),
+            options=chrome_options
+        )
+
+    def close(self) -> None:
+        if self.driver:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+        self.logged_in = False
+
+    def login_to_getmarks(self) -> None:
+        """Log in to GetMarks using the provided credentials"""
+        try:
+            self.update_status("Logging in to GetMarks...")
+
+            self.driver.get(LOGIN_URL)
+
+            WebDriverWait(self.driver, 10).until(
+                EC.presence_of_element_located((By.ID, "email"))
+            )
+
+            self.driver.find_element(By.ID, "email").send_keys(self.username)
+            self.driver.find_element(By.ID, "password").send_keys(self.password)
+            self.driver.find_element(By.XPATH, "//button[@type='submit']").click()
+
+            WebDriverWait(self.driver, 10).until(
+                EC.presence_of_element_located((By.XPATH, "//nav"))
+            )
+
+            self.update_status("Successfully logged in to GetMarks")
+
+        except Exception as e:
+            logger.error(f"Login failed: {e}")
+            raise Exception(f"Failed to log in to GetMarks: {e}")
+
+    def navigate_to_exam(self, url: str) -> None:
+        """Navigate to the exam page"""
+        try:
+            self.update_status(f"Navigating to exam page: {url}")
+            self.driver.get(url)
+
+            WebDriverWait(self.driver, 10).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "body"))
+            )
+
+            self.update_status("Successfully loaded exam page")
+
+        except Exception as e:
+            logger.error(f"Navigation failed: {e}")
+            raise Exception(f"Failed to navigate to exam page: {e}")
+
+    def extract_questions_data(self) -> List[Dict[str, Any]]:
+        """Extract question data from the current page"""
+        try:
+            current_url = self.driver.current_url
+            self.update_status(f"Extracting data from: {current_url}")
+
+            self.update_status("Waiting for questions to load...")
+            with tracer.span("wait_question_links"):
+                WebDriverWait(self.driver, 15).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "a[href*='/question/']"))
+                )
+
+            question_links = []
+            seen_ids = set()
+            for link in self.driver.find_elements(By.CSS_SELECTOR, "a[href*='/question/']"):
+                href = link.get_attribute("href")
+                if href and "/question/" in href:
+                    question_id = href.split("/")[-1]
+                    if question_id not in seen_ids:
+                        seen_ids.add(question_id)
+                        question_links.append({
+                            "id": question_id,
+                            "url": href
+                        })
+
+            total_questions = len(question_links)
+            self.update_status(f"Found {total_questions} questions")
+
+            if total_questions == 0:
+                self.emit("info", "No questions found on this page.")
+                return []
+
+            all_questions = []
+            for i, question in enumerate(question_links):
+                if self.stop_event.is_set():
+                    self.update_status("Scraping stopped by user")
+                    break
+
+                current_question = i + 1
+                self.update_status(f"Processing question {current_question}/{total_questions}: {question['id']}")
+                self.emit("progress", current=current_question, total=total_questions)
+
+                with tracer.question(question["id"]):
+                    question_data = self.scrape_question(question)
+                if question_data:
+                    all_questions.append(question_data)
+
+                # Polite delay between questions; returns early if a stop is requested
+                self.stop_event.wait(self.question_delay)
+
+            return all_questions
+
+        except TimeoutException:
+            error_msg = "Timed out waiting for questions to load."
+            logger.error(error_msg)
+            self.emit("error", error_msg)
+            return []
+
+        except Exception as e:
+            error_msg = f"Error extracting questions data: {e}"
+            logger.error(error_msg)
+            self.emit("error", error_msg)
+            return []
+
+    def scrape_question(self, question: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """Load one question page and extract its text, options and solution"""
+        with tracer.span("page_load"):
+            self.driver.get(question["url"])
+
+            WebDriverWait(self.driver, 10).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, ".ques-text, .question-content"))
+            )
+
+        try:
+            with tracer.span("extract_fields"):
+                question_text_element = self.driver.find_element(By.CSS_SELECTOR, ".ques-text, .question-content")
+                question_text = question_text_element.get_attribute("innerHTML").strip()
+
+                options = []
+                try:
+                    option_elements = self.driver.find_elements(By.CSS_SELECTOR, ".option-wrapper, .option-item")
+                    for opt in option_elements:
+                        option_text = opt.get_attribute("innerHTML").strip()
+                        is_correct = "correct" in opt.get_attribute("class").lower()
+                        options.append({
+                            "text": option_text,
+                            "isCorrect": is_correct
+                        })
+                except Exception as e:
+                    logger.warning(f"Error getting options: {e}")
+
+            solution_text = ""
+            try:
+                with tracer.span("solution_wait"):
+                    solution_btn = self.driver.find_element(By.XPATH, "//button[contains(text(), 'Solution')]")
+                    solution_btn.click()
+
+                    WebDriverWait(self.driver, 5).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, ".solution-text, .solution-content"))
+                    )
+
+                    solution_element = self.driver.find_element(By.CSS_SELECTOR,
+                                                                ".solution-text, .solution-content")
+                    solution_text = solution_element.get_attribute("innerHTML").strip()
+            except Exception as e:
+                logger.warning(f"Error getting solution: {e}")
+
+            return {
+                "_id": question["id"],
+                "question": {
+                    "text": question_text
+                },
+                "options": options,
+                "solution": {
+                    "text": solution_text
+                }
+            }
+
+        except Exception as e:
+            logger.error(f"Error extracting data for question {question['id']}: {e}")
+            return None
+
+    def scrape(self, exam_url: str, exam_id: str, output_file: str) -> List[Dict[str, Any]]:
+        """Scrape one exam into output_file, emitting a final "done" or "error" event."""
+        self.exam_id = exam_id
+        questions = []
+        try:
+            if not self.logged_in:
+                self.close()
+                with tracer.span("setup_driver"):
+                    self.setup_driver()
+                with tracer.span("login"):
+                    self.login_to_getmarks()
+                self.logged_in = True
+
+            with tracer.span("navigate", exam=exam_id):
+                self.navigate_to_exam(exam_url)
+            questions = self.extract_questions_data()
+
+            if questions:
+                os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+                with tracer.span("json_write"), open(output_file, "w", encoding="utf-8") as f:
+                    json.dump({
+                        "exam_id": exam_id,
+                        "questions": questions
+                    }, f, ensure_ascii=False, indent=2)
+
+                message = f"Successfully saved {len(questions)} questions to {output_file}"
+                self.update_status(message)
+                self.emit("done", message, payload=output_file)
+            else:
+                self.update_status("No questions were extracted")
+                self.emit("done", "No questions were extracted")
+
+        except Exception as e:
+            error_msg = f"Error during scraping: {e}"
+            logger.error(error_msg)
+            self.update_status("Error occurred")
+            self.emit("error", error_msg)
+
+        return questions
+
+
+def exam_target(exam: str, url_template: Optional[str]) -> Dict[str, str]:
+    """Turn a CLI exam argument (a URL or an exam ID) into {"id", "url"}."""
+    if exam.startswith("http://") or exam.startswith("https://"):
+        return {"id": exam.rstrip("/").split("/")[-1], "url": exam}
+    if not url_template:
+        raise ValueError(f"Exam ID {exam} needs --url-template, e.g. 'https://getmarks.app/.../{{exam_id}}'")
+    return {"id": exam, "url": url_template.format(exam_id=exam)}
+
+
+def scrape_batch(exams: List[Dict[str, str]], username: str, password: str, output_dir: str,
+                 workers: int = 2, headless: bool = True, question_delay: float = 1.0,
+                 events: Optional["queue.Queue[ScrapeEvent]"] = None,
+                 stop_event: Optional[threading.Event] = None) -> Dict[str, str]:
+    """Scrape exams with at most `workers` browsers at once. Returns exam id -> output file."""
+    events = events if events is not None else queue.Queue()
+    stop_event = stop_event or threading.Event()
+    pending = queue.Queue()
+    for exam in exams:
+        pending.put(exam)
+
+    def worker() -> Dict[str, str]:
+        # Each worker keeps one logged-in browser for all the exams it picks up.
+        core = ScraperCore(username, password, events, headless, question_delay, stop_event)
+        saved = {}
+        try:
+            with tracer.profiled():
+                while not stop_event.is_set():
+                    try:
+                        exam = pending.get_nowait()
+                    except queue.Empty:
+                        break
+                    output_file = os.path.join(output_dir, f"{exam['id']}.json")
+                    if core.scrape(exam["url"], exam["id"], output_file):
+                        saved[exam["id"]] = output_file
+        finally:
+            core.close()
+        return saved
+
+    saved = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(exams)))) as executor:
+        futures = [executor.submit(worker) for _ in range(max(1, min(workers, len(exams))))]
+        for future in as_completed(futures):
+            saved.update(future.result())
+    return saved
+
+
+def _asset_downloader() -> Any:
+    if __package__:
+        from . import asset_downloader
+    else:
+        import asset_downloader
+    return asset_downloader
+
+
+def localize_assets(saved: Dict[str, str], downloader: Any, base_url: str) -> None:
+    """Download the images of scraped exams and write <exam_id>_offline.json next to each file."""
+    localize_exam_file = _asset_downloader().localize_exam_file
+
+    for exam_id, output_file in sorted(saved.items()):
+        offline_file = os.path.splitext(output_file)[0] + "_offline.json"
+        with tracer.span("localize_assets", exam=exam_id):
+            count = localize_exam_file(output_file, offline_file, downloader, base_url)
+        print(f"[{exam_id}] localized {count} assets into {offline_file}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless GetMarks scraper")
+    parser.add_argument("exams", nargs="+", help="Exam URLs, or exam IDs together with --url-template")
+    parser.add_argument("--url-template", help="Exam URL with an {exam_id} placeholder")
+    parser.add_argument("--output-dir", default="exams", help="Directory for <exam_id>.json files")
+    parser.add_argument("--workers", type=int, default=2, help="Maximum concurrent browsers")
+    parser.add_argument("--question-delay", type=float, default=1.0, help="Seconds to wait between questions")
+    parser.add_argument("--show-browser", action="store_true", help="Run Chrome with a visible window")
+    parser.add_argument("--log-file", default="scraper_log.txt", help="Log file")
+    parser.add_argument("--assets-dir",
+                        help="Also download question images here and write <exam_id>_offline.json (needs aiohttp)")
+    parser.add_argument("--asset-base-url", default="https://getmarks.app/",
+                        help="Base URL for relative asset links")
+    parser.add_argument("--asset-mirror", action="append", default=[], metavar="FROM=TO",
+                        help="Fetch asset URLs starting with FROM from TO instead (repeatable)")
+    add_tracing_arguments(parser)
+    args = parser.parse_args()
+
+    username = os.environ.get("GETMARKS_USERNAME")
+    password = os.environ.get("GETMARKS_PASSWORD")
+    if not (username and password):
+        parser.error("Set GETMARKS_USERNAME and GETMARKS_PASSWORD")
+    if (args.profile or args.trace_memory) and args.workers > 1:
+        # cProfile allows one active profiler per process on Python 3.12+, and tracemalloc
+        # deltas are process-wide, so concurrent workers would be mixed into each other's numbers.
+        parser.error("--profile and --trace-memory need --workers 1")
+
+    downloader = None
+    if args.assets_dir:
+        # aiohttp is only needed for this optional step
+        try:
+            asset_downloader = _asset_downloader()
+            downloader = asset_downloader.AssetDownloader(
+                args.assets_dir, mirrors=dict(asset_downloader.parse_mirror(m) for m in args.asset_mirror))
+        except ImportError as e:
+            parser.error(f"--assets-dir needs aiohttp ({e})")
+        except argparse.ArgumentTypeError as e:
+            parser.error(f"--asset-mirror: {e}")
+
+    exams = [exam_target(exam, args.url_template) for exam in args.exams]
+
+    listener = setup_logging(args.log_file)
+    configure_from_args(args)
+    events = queue.Queue()
+    stop_event = threading.Event()
+    saved = {}
+    try:
+        thread = threading.Thread(
+            target=lambda: saved.update(scrape_batch(exams, username, password, args.output_dir, args.workers,
+                                                     not args.show_browser, args.question_delay,
+                                                     events, stop_event)),
+            daemon=True
+        )
+        thread.start()
+
+        # Status lines are already logged by the workers; only surface terminal events here.
+        while thread.is_alive() or not events.empty():
+            try:
+                event = events.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            if event.kind in ("done", "error", "info"):
+                print(f"[{event.exam_id}] {event.kind}: {event.message}")
+
+        if downloader and saved:
+            localize_assets(saved, downloader, args.asset_base_url)
+    except KeyboardInterrupt:
+        print("Interrupted, stopping workers...")
+        stop_event.set()
+        thread.join()
+    finally:
+        tracer.finish()
+        listener.stop()
+
+    print(f"Scraped {len(saved)}/{len(exams)} exams into {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
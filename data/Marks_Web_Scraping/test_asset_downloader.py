@@ -0,0 +1,130 @@
+"""
+Tests for asset_downloader against a local fixture server.
+
+Run from the repository root: python -m unittest data.Marks_Web_Scraping.test_asset_downloader
+"""
+
+import copy
+import functools
+import http.server
+import os
+import tempfile
+import threading
+import unittest
+
+try:
+    import aiohttp  # noqa: F401
+except ImportError:
+    aiohttp = None
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"figure-1" * 64
+GIF = b"GIF89a" + b"figure-2" * 64
+
+QUESTIONS = [
+    {
+        "_id": "q1",
+        "question": {"text": '<p>Find x</p><img src="https://cdn.getmarks.app/img/a.png">'},
+        "options": [{"text": '<img src="/img/c.gif" alt="c">', "isCorrect": True}],
+        "solution": {"text": '<img src="https://cdn.getmarks.app/img/missing.png">'},
+    },
+    {
+        "_id": "q2",
+        # Same bytes as a.png under another URL; stored once
+        "question": {"text": '<img src="https://cdn.getmarks.app/img/b.png">'},
+        "options": [],
+        "solution": {"text": ""},
+    },
+]
+
+
+@unittest.skipIf(aiohttp is None, "aiohttp is not installed")
+class LocalizeQuestionsTest(unittest.TestCase):
+    def setUp(self):
+        from data.Marks_Web_Scraping.asset_downloader import AssetDownloader, localize_questions
+
+        self.AssetDownloader = AssetDownloader
+        self.localize_questions = localize_questions
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+
+        site = os.path.join(self.root, "site", "img")
+        os.makedirs(site)
+        for name, content in (("a.png", PNG), ("b.png", PNG), ("c.gif", GIF)):
+            with open(os.path.join(site, name), 'wb') as f:
+                f.write(content)
+
+        self.requests = []
+        requests = self.requests
+
+        class Handler(http.server.SimpleHTTPRequestHandler):
+            def do_GET(self):
+                requests.append(self.path)
+                super().do_GET()
+
+            def log_message(self, *args):
+                pass
+
+        handler = functools.partial(Handler, directory=os.path.join(self.root, "site"))
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        server_url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+        self.mirrors = {"https://cdn.getmarks.app/": server_url, "https://getmarks.app/": server_url}
+        self.asset_dir = os.path.join(self.root, "assets")
+        self.output_dir = os.path.join(self.root, "exams")
+        os.makedirs(self.output_dir)
+
+    def localize(self, questions):
+        downloader = self.AssetDownloader(self.asset_dir, concurrency=2, timeout=5, retries=0,
+                                          mirrors=self.mirrors)
+        return self.localize_questions(questions, downloader, self.output_dir, "https://getmarks.app/")
+
+    def stored_files(self):
+        return sorted(os.path.join(os.path.basename(d), f)
+                      for d, _, files in os.walk(self.asset_dir) for f in files if f != "manifest.json")
+
+    def test_dedupes_by_content_hash(self):
+        questions = copy.deepcopy(QUESTIONS)
+        self.assertEqual(self.localize(questions), 3)
+        self.assertEqual(len(self.stored_files()), 2)
+
+        a_path = questions[0]["question"]["text"].split('src="')[1].split('"')[0]
+        b_path = questions[1]["question"]["text"].split('src="')[1].split('"')[0]
+        self.assertEqual(a_path, b_path)
+
+    def test_rewrites_html_to_local_paths(self):
+        questions = copy.deepcopy(QUESTIONS)
+        self.localize(questions)
+
+        question_html = questions[0]["question"]["text"]
+        self.assertNotIn("cdn.getmarks.app/img/a.png", question_html)
+        local = question_html.split('src="')[1].split('"')[0]
+        self.assertTrue(local.startswith("../assets/"))
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, local)))
+
+        option_html = questions[0]["options"][0]["text"]
+        self.assertIn('alt="c"', option_html)
+        self.assertTrue(option_html.split('src="')[1].split('"')[0].endswith(".gif"))
+
+        # Failed downloads keep the original link
+        self.assertIn("https://cdn.getmarks.app/img/missing.png", questions[0]["solution"]["text"])
+
+    def test_resumes_from_manifest(self):
+        self.localize(copy.deepcopy(QUESTIONS))
+        fetched = len(self.requests)
+
+        questions = copy.deepcopy(QUESTIONS)
+        self.assertEqual(self.localize(questions), 3)
+        # Only the asset that failed before is requested again
+        self.assertEqual(self.requests[fetched:], ["/img/missing.png"])
+        self.assertNotIn("cdn.getmarks.app/img/b.png", questions[1]["question"]["text"])
+
+
+if __name__ == "__main__":
+    unittest.main()